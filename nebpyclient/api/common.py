@@ -11,6 +11,7 @@
 # DEALINGS IN THE SOFTWARE.
 #
 
+import re
 from enum import Enum
 from datetime import datetime
 
@@ -24,6 +25,10 @@ __all__ = [
     "ResourceType",
 ]
 
+# JSON encoded time as returned by nebulon ON. Example: 2020-01-01T10:10:10Z
+_TIME_PATTERN = re.compile(
+    r"([0-9]{4})-([0-9]{2})-([0-9]{2})T([0-9]{2}):([0-9]{2}):([0-9]{2})Z")
+
 
 def parse_time(value: str) -> datetime:
     """Parse and convert JSON encoded string to a datetime object
@@ -39,6 +44,12 @@ def parse_time(value: str) -> datetime:
     """
 
     try:
+        # fast path for the format used by nebulon ON, which avoids the
+        # considerably slower format string interpretation of strptime
+        match = _TIME_PATTERN.fullmatch(value)
+        if match is not None:
+            return datetime(*map(int, match.groups()))
+
         return datetime.strptime(value, "%Y-%m-%dT%H:%M:%SZ")
     except ValueError:
         return datetime.min
@@ -105,21 +116,22 @@ def read_value(
     """
 
     # build the path. we expect a ``key_path`` that looks like this:
-    # "key1.key2.key3" -> ["key1", "key2", "key3"]
-    segments = key_path.split(".")
+    # "key1.key2.key3" -> key "key1" and child key "key2.key3". Partitioning
+    # only splits off the current key instead of the entire path.
+    key, _, child_key = key_path.partition(".")
 
-    # segments should always have at least one element that exists in the
-    # dictionary that is provided via ``data``.
-    if data is None or len(segments) == 0 or segments[0] not in data:
+    # handle the current key. this could be any key in the hierarchy. The
+    # key should always exist in the dictionary that is provided via
+    # ``data``, so it is looked up directly instead of checked first.
+    try:
+        value = data[key]
+    except (KeyError, TypeError):
         if mandatory:
-            raise ValueError(f"provided key {key_path} is invalid for {data}")
+            raise ValueError(
+                f"provided key {key_path} is invalid for {data}") from None
 
         return None
 
-    # handle the current key. this could be any key in the hierarchy
-    key = segments[0]
-    value = data[key]
-
     # first we need to check for it to be not None if it is a mandatory value.
     # it is ok to return None if the value is not mandatory
     if value is None:
@@ -130,22 +142,42 @@ def read_value(
 
     # if there are more children, we need to return the contents of these
     # instead of the current value
-    if len(segments) > 1:
-
-        child_key = ".".join(segments[1:])
+    if child_key:
 
-        # handle lists separately
+        # handle lists separately. If the child key is the last element in
+        # the hierarchy, values of the expected type are taken from the list
+        # items directly instead of through a lookup per item
         if isinstance(value, list):
+            if "." not in child_key:
+                return [
+                    i[child_key] if type(i) is dict
+                    and type(i.get(child_key)) is data_type
+                    else read_value(child_key, i, data_type, mandatory)
+                    for i in value
+                ]
+
             return [read_value(child_key, i, data_type, mandatory)
                     for i in value]
 
         # single items we can just return
         return read_value(child_key, value, data_type, mandatory)
 
-    # this is the last element in the hierarchy and we need to convert it to
-    # the expected data_type. Handle list separately
+    # this is the last element in the hierarchy. Most values are returned by
+    # the API in the expected type already. These are returned without the
+    # overhead of the conversion function.
+    if type(value) is data_type:
+        return value
+
+    # otherwise we need to convert it to the expected data_type. Handle list
+    # separately. Lists typically hold values of the expected type or dicts
+    # of objects, which are returned or constructed directly
     if isinstance(value, list):
-        return [__convert_value(key, i, data_type) for i in value]
+        return [
+            i if type(i) is data_type
+            else data_type(i) if type(i) is dict
+            else __convert_value(key, i, data_type)
+            for i in value
+        ]
 
     return __convert_value(key, value, data_type)
 
@@ -233,14 +265,13 @@ class NebEnum(Enum):
         if value is None or len(value) == 0:
             raise ValueError("provided value may not be None or empty")
 
-        for item in cls:
-            if value == item.value:
-                # found a matching value
-                return item
-
-        # Fallback value in case the API adds an enum that is not supported
-        # by an older version of the SDK
-        return cls.Unknown
+        try:
+            # lookup the matching member through the value map of the enum
+            return cls(value)
+        except ValueError:
+            # Fallback value in case the API adds an enum that is not supported
+            # by an older version of the SDK
+            return cls.Unknown
 
 
 class DateFormat(NebEnum):
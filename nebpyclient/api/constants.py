@@ -23,3 +23,12 @@ RECIPE_TIMEOUT_SECONDS = 60 * 45
 
 """Timeout for token delivery"""
 TOKEN_TIMEOUT_SECONDS = 60 * 2
+
+"""Maximum number of SPUs that a token is delivered to concurrently"""
+TOKEN_MAX_WORKERS = 16
+
+"""Maximum number of pages that are retrieved with a single batched query"""
+QUERY_BATCH_MAX_PAGES = 10
+
+"""Maximum number of operations that are sent with a single batched request"""
+BATCH_MAX_OPERATIONS = 50
@@ -15,10 +15,19 @@ import platform
 import os
 import json
 from typing import List, Dict, Any
+from collections.abc import Mapping
+from functools import lru_cache
 from enum import Enum, IntEnum
 from requests import Session
 from datetime import datetime
-from .constants import API_SERVER_URI
+from .common import PageInput
+from .constants import API_SERVER_URI, QUERY_BATCH_MAX_PAGES, \
+    BATCH_MAX_OPERATIONS
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 __all__ = [
     "NebMixin",
@@ -28,6 +37,42 @@ __all__ = [
 ]
 
 
+def _json_loads(data: bytes) -> any:
+    """Decodes a JSON document
+
+    Uses ``orjson`` for decoding if it is installed and falls back to the
+    ``json`` module from the standard library otherwise.
+
+    :param data: The JSON document to decode
+    :type data: bytes
+
+    :returns any: The decoded JSON document
+    """
+
+    if orjson is not None:
+        return orjson.loads(data)
+
+    return json.loads(data)
+
+
+def _json_dumps(obj: any) -> bytes:
+    """Encodes an object as a UTF-8 encoded JSON document
+
+    Uses ``orjson`` for encoding if it is installed and falls back to the
+    ``json`` module from the standard library otherwise.
+
+    :param obj: The object to encode
+    :type obj: any
+
+    :returns bytes: The encoded JSON document
+    """
+
+    if orjson is not None:
+        return orjson.dumps(obj)
+
+    return json.dumps(obj).encode("utf-8")
+
+
 class ConsoleColor(IntEnum):
     """Color used for printing to the console"""
     Gray = 0
@@ -126,6 +171,84 @@ class NebMixin:
         """
         pass
 
+    def _query_batch(
+            self,
+            name: str,
+            params: List[dict],
+            fields: List[str] = None
+    ) -> List[any]:
+        """Run a GraphQL query for multiple sets of parameters.
+
+        :param name: Name of the query
+        :type name: str
+        :param params: A list of dicts of GraphQLParams. The query is run once
+            for every dict in the list, with up to ``BATCH_MAX_OPERATIONS``
+            queries per request.
+        :type params: List[dict]
+        :param fields: A list of fields that shall be returned by the
+            GraphQL query
+        :type fields: List[str], optional
+
+        :returns List[any]: The responses from the server in the order of
+            the provided parameters
+
+        :raises GraphQLError:  An error raised by the GraphQL endpoint.
+        """
+        pass
+
+    def _mutation_batch(
+            self,
+            name: str,
+            params: List[dict],
+            fields: List[str] = None
+    ) -> List[any]:
+        """Run a GraphQL mutation for multiple sets of parameters.
+
+        :param name: Name of the mutation
+        :type name: str
+        :param params: A list of dicts of GraphQLParams. The mutation is run
+            once for every dict in the list, with up to
+            ``BATCH_MAX_OPERATIONS`` mutations per request.
+        :type params: List[dict]
+        :param fields: A list of fields that shall be returned by the
+            GraphQL query
+        :type fields: List[str], optional
+
+        :returns List[any]: The responses from the server in the order of
+            the provided parameters
+
+        :raises GraphQLError:  An error raised by the GraphQL endpoint. The
+            ``results`` of the error hold the responses of the mutations that
+            succeeded and ``None`` for mutations whose outcome is unknown.
+        """
+        pass
+
+    def _query_all_pages(
+            self,
+            name: str,
+            params: dict = None,
+            fields: List[str] = None,
+            page_size: int = 100
+    ) -> List[any]:
+        """Run a paginated GraphQL query and retrieve all pages.
+
+        :param name: Name of the query
+        :type name: str
+        :param params: A dict of GraphQLParams that shall be supplied to the
+            GraphQL query. The ``page`` parameter is managed by this method.
+        :type params: dict
+        :param fields: A list of fields that shall be returned by the
+            GraphQL query
+        :type fields: List[str], optional
+        :param page_size: The number of items to request per page
+        :type page_size: int, optional
+
+        :returns List[any]: The responses from the server for all pages
+
+        :raises GraphQLError:  An error raised by the GraphQL endpoint.
+        """
+        pass
+
     def _wait_on_recipes(
         self,
         delivery_response: Dict[str, Any],
@@ -146,6 +269,13 @@ class NebMixin:
 class GraphQLParam:
     """A parameter for a GraphQL query (query or mutation)"""
 
+    __slots__ = (
+        "__value",
+        "__type_name",
+        "__mandatory",
+        "__no_log",
+    )
+
     def __init__(
             self,
             value: any,
@@ -209,7 +339,8 @@ class GraphQLError(Exception):
             self,
             request: str = None,
             response: dict = None,
-            status_code: int = None
+            status_code: int = None,
+            results: list = None
     ):
         """Constructs a new GraphQLError
 
@@ -219,10 +350,15 @@ class GraphQLError(Exception):
         :type response: str, optional
         :param status_code: The HTTP status code from the API server
         :type status_code: int, optional
+        :param results: The results of the individual operations of a
+            batched request in the order of the batch
+        :type results: list, optional
         """
         self.__errors = []
         self.__status_code = status_code
         self.__request = request
+        self.__response = response
+        self.__results = results
 
         for error in response["errors"]:
             self.errors.append(error["message"])
@@ -242,6 +378,27 @@ class GraphQLError(Exception):
         """The request that was sent to the server as a string"""
         return self.__request
 
+    @property
+    def response(self) -> dict:
+        """The response from nebulon ON as a dict"""
+        return self.__response
+
+    @property
+    def results(self) -> list:
+        """Results of the individual operations of a batched request
+
+        Operations of a batched mutation are not transactional. The list
+        holds the result of every operation that succeeded and ``None`` for
+        every other operation, in the order of the batch. ``None`` if the
+        error is not related to a batched mutation.
+
+        A ``None`` entry does not mean that the operation was not applied.
+        If an operation with a non-nullable result fails, the server discards
+        the data of the entire batch and every entry is ``None``, although
+        the operations before the failed one were applied.
+        """
+        return self.__results
+
     def __str__(self):
         result = "<GraphQLException> "
         if self.status_code is not None:
@@ -254,6 +411,63 @@ class GraphQLError(Exception):
         return result.strip()
 
 
+@lru_cache(maxsize=512)
+def _build_method(
+        method: str,
+        name: str,
+        signature: tuple,
+        fields: tuple
+) -> str:
+    """Build the GraphQL text of a query or mutation
+
+    The GraphQL text only depends on the method, the parameter names and
+    types, and the requested fields. It is therefore cached and reused for
+    subsequent calls of the same operation.
+
+    :param method: Method type of the GraphQL query. This can either be
+        a mutation or a query.
+    :type method: str
+    :param name: Name of the GraphQL query (query or mutation) to execute
+    :type name: str
+    :param signature: Tuple of parameter names and GraphQL type specifications
+    :type signature: tuple
+    :param fields: Fields to return by the GraphQL query
+    :type fields: tuple
+
+    :returns str: A str encoded GraphQL query.
+    """
+
+    variable_specs = [f"${key}:{type_spec}" for key, type_spec in signature]
+    variable_mappings = [f"{key}: ${key}" for key, _ in signature]
+
+    if fields is not None:
+        query_fields = ",".join(fields)
+    else:
+        query_fields = ""
+
+    if len(variable_specs) == 0 and len(query_fields) == 0:
+        return "%s{%s}" % (method, name)
+
+    if len(variable_specs) == 0 and len(query_fields) > 0:
+        return "%s{%s{%s}}" % (method, name, query_fields)
+
+    if len(variable_specs) > 0 and len(query_fields) == 0:
+        return "%s(%s){%s(%s)}" % (
+            method,
+            ",".join(variable_specs),
+            name,
+            ", ".join(variable_mappings)
+        )
+
+    return "%s(%s){%s(%s){%s}}" % (
+        method,
+        ",".join(variable_specs),
+        name,
+        ", ".join(variable_mappings),
+        query_fields
+    )
+
+
 class GraphQLClient:
     """GraphQL client to make requests with nebulon ON"""
 
@@ -359,7 +573,8 @@ class GraphQLClient:
     ) -> any:
         """Makes a GraphQL request to the specified server
 
-        :param name: The GraphQL method name
+        :param name: The GraphQL method name. If set to ``None`` the
+            results of all methods in the request are returned as a dict.
         :type name: str
         :param method: The GraphQL method in string representation
         :type method: str
@@ -419,9 +634,13 @@ class GraphQLClient:
         else:
             data["query"] = method
             data["variables"] = dict_vars
-            response = self.session.post(self.uri, json=data)
+            response = self.session.post(
+                self.uri,
+                data=_json_dumps(data),
+                headers={"Content-Type": "application/json"}
+            )
 
-        json_data = response.json()
+        json_data = _json_loads(response.content)
 
         # DEBUG INFORMATION
         if self.verbose:
@@ -445,6 +664,9 @@ class GraphQLClient:
             )
 
         # Make sure only the relevant contents are returned
+        if "data" in json_data and name is None:
+            return json_data["data"]
+
         if "data" in json_data and name in json_data["data"]:
             return json_data["data"][name]
 
@@ -471,7 +693,8 @@ class GraphQLClient:
                 no_log = True
             obj = obj.value
 
-        if isinstance(obj, dict):
+        # input objects may return read-only mappings from ``as_dict``
+        if isinstance(obj, Mapping):
             result = dict()
             for key, value in obj.items():
                 processed_value = cls._convert_dict(value, save, "password" in key)
@@ -497,6 +720,34 @@ class GraphQLClient:
 
         return obj
 
+    @classmethod
+    def _drop_unset_params(
+            cls,
+            params: dict
+    ) -> dict:
+        """Removes optional GraphQL parameters that have no value
+
+        Optional parameters that are ``None`` are omitted from the GraphQL
+        request instead of being declared as variables without a value. This
+        does not change the meaning of the request, but keeps the GraphQL
+        document smaller.
+
+        :param params: Parameters for the GraphQL query
+        :type params: dict
+
+        :returns dict: The parameters with a value or that are mandatory
+        """
+
+        if params is None:
+            return None
+
+        return {
+            key: value for key, value in params.items()
+            if not isinstance(value, GraphQLParam)
+            or value.mandatory
+            or value.value is not None
+        }
+
     @classmethod
     def _extract_files(
             cls,
@@ -564,7 +815,8 @@ class GraphQLClient:
             background=ConsoleColor.Blue
         )
 
-        parameters, files = self._extract_files(params)
+        parameters = self._drop_unset_params(params)
+        parameters, files = self._extract_files(parameters)
         method = self._format_method("mutation", name, parameters, fields)
         return self._call(name, method, parameters, files)
 
@@ -595,8 +847,287 @@ class GraphQLClient:
             background=ConsoleColor.Purple
         )
 
-        method = self._format_method("query", name, params, fields)
-        return self._call(name, method, params)
+        parameters = self._drop_unset_params(params)
+        method = self._format_method("query", name, parameters, fields)
+        return self._call(name, method, parameters)
+
+    def _query_batch(
+            self,
+            name: str,
+            params: List[dict],
+            fields: List[str] = None
+    ) -> List[any]:
+        """Run a GraphQL query for multiple sets of parameters.
+
+        Up to ``BATCH_MAX_OPERATIONS`` queries are sent to the server in a
+        single GraphQL request in which every query is addressed through an
+        alias. This allows retrieving the results for multiple parameter sets
+        with a single network round-trip. Larger batches are split into
+        several requests.
+
+        :param name: The name of the query
+        :type name: str
+        :param params: A list of parameter dicts. The query is run once for
+            every dict in the list.
+        :type params: List[dict]
+        :param fields: Fields to query the result for
+        :type fields: List[str], optional
+
+        :returns List[any]: The responses from the server in the order of
+            the provided parameters
+
+        :raises GraphQLError: An error with the GraphQL endpoint.
+        """
+
+        result = []
+
+        for start in range(0, len(params), BATCH_MAX_OPERATIONS):
+            chunk = params[start:start + BATCH_MAX_OPERATIONS]
+
+            # DEBUG INFORMATION
+            self._print(
+                text=f"# QUERY BATCH: {name} ({len(chunk)}) ----------",
+                verbose=True,
+                background=ConsoleColor.Purple
+            )
+
+            method, variables = self._format_batch_method(
+                "query", name, chunk, fields)
+            response = self._call(None, method, variables)
+            result.extend(response[f"b{i}"] for i in range(len(chunk)))
+
+        return result
+
+    def _mutation_batch(
+            self,
+            name: str,
+            params: List[dict],
+            fields: List[str] = None
+    ) -> List[any]:
+        """Run a GraphQL mutation for multiple sets of parameters.
+
+        Up to ``BATCH_MAX_OPERATIONS`` mutations are sent to the server in a
+        single GraphQL request in which every mutation is addressed through an
+        alias. The server runs the mutations one after the other in the order
+        of the provided parameters. Larger batches are split into several
+        requests that are sent one after the other.
+
+        :param name: The name of the mutation
+        :type name: str
+        :param params: A list of parameter dicts. The mutation is run once
+            for every dict in the list.
+        :type params: List[dict]
+        :param fields: Fields to query the result for
+        :type fields: List[str], optional
+
+        :returns List[any]: The responses from the server in the order of
+            the provided parameters
+
+        :raises GraphQLError: An error with the GraphQL endpoint. The
+            mutations are not transactional. If some of them fail, the
+            ``results`` of the error hold the responses of the mutations that
+            succeeded and ``None`` for the others. ``None`` means that the
+            outcome of the mutation is unknown: if the server returns no data
+            for the batch, every result is ``None`` even though some of the
+            mutations may have been applied. Requests for the remaining
+            mutations of a larger batch are not sent after a request failed
+            and their results are ``None``.
+        """
+
+        result = []
+
+        for start in range(0, len(params), BATCH_MAX_OPERATIONS):
+            chunk = params[start:start + BATCH_MAX_OPERATIONS]
+
+            # DEBUG INFORMATION
+            self._print(
+                text=f"# MUTATION BATCH: {name} ({len(chunk)}) ----------",
+                verbose=True,
+                background=ConsoleColor.Blue
+            )
+
+            method, variables = self._format_batch_method(
+                "mutation", name, chunk, fields)
+
+            try:
+                response = self._call(None, method, variables)
+            except GraphQLError as error:
+                # mutations that succeeded were applied by the server, so
+                # their results are passed on with the error
+                data = error.response.get("data")
+                result.extend(
+                    (data or dict()).get(f"b{i}") for i in range(len(chunk)))
+                result.extend([None] * (len(params) - len(result)))
+
+                batch_error = GraphQLError(
+                    request=error.request,
+                    response=error.response,
+                    status_code=error.status_code,
+                    results=result
+                )
+
+                # a failed mutation with a non-nullable result discards the
+                # data of the entire request, including the results of
+                # mutations that were applied before it
+                if data is None:
+                    batch_error.errors.append(
+                        "the server returned no data for the batch, so it is "
+                        "unknown which of the mutations were applied")
+
+                raise batch_error from None
+
+            result.extend(response[f"b{i}"] for i in range(len(chunk)))
+
+        return result
+
+    def _query_all_pages(
+            self,
+            name: str,
+            params: dict = None,
+            fields: List[str] = None,
+            page_size: int = 100
+    ) -> List[any]:
+        """Run a paginated GraphQL query and retrieve all pages.
+
+        The first page is queried to learn the number of matching items and
+        the number of items the server returns per page. The remaining pages
+        are then retrieved with batched requests of up to
+        ``QUERY_BATCH_MAX_PAGES`` pages each instead of one request per page.
+
+        :param name: The name of the query
+        :type name: str
+        :param params: Parameters for the GraphQL query. The ``page``
+            parameter is managed by this method.
+        :type params: dict, optional
+        :param fields: Fields to query the result for. The fields must
+            include ``items``, ``more`` and ``filteredCount``.
+        :type fields: List[str], optional
+        :param page_size: The number of items to request per page. Defaults
+            to ``100`` items.
+        :type page_size: int, optional
+
+        :returns List[any]: The responses from the server for all pages
+
+        :raises ValueError: If the page size is not positive or if the server
+            reports more items without returning any
+        :raises GraphQLError: An error with the GraphQL endpoint.
+        """
+
+        if page_size <= 0:
+            raise ValueError("page_size must be a positive number")
+
+        def page_params(page: int, count: int) -> dict:
+            result = dict(params) if params is not None else dict()
+            result["page"] = GraphQLParam(
+                PageInput(page=page, count=count), "PageInput", False)
+            return result
+
+        pages = [self._query(name, page_params(1, page_size), fields)]
+
+        # the server may return fewer items per page than requested, e.g.
+        # when it limits the page size. Subsequent pages are requested with
+        # the page size that the server actually used, so that no items are
+        # skipped
+        count = len(pages[0]["items"] or [])
+        next_page = 2
+
+        while pages[-1]["more"]:
+            if count == 0 or not pages[-1]["items"]:
+                raise ValueError(
+                    f"{name} reports more items but returned an empty page")
+
+            page_count = -(-pages[-1]["filteredCount"] // count)
+            last_page = min(
+                max(page_count, next_page),
+                next_page + QUERY_BATCH_MAX_PAGES - 1
+            )
+
+            pages += self._query_batch(
+                name=name,
+                params=[page_params(i, count)
+                        for i in range(next_page, last_page + 1)],
+                fields=fields
+            )
+            next_page = last_page + 1
+
+        return pages
+
+    @classmethod
+    def _format_batch_method(
+            cls,
+            method: str,
+            name: str,
+            params: List[dict],
+            fields: List[str] = None
+    ) -> tuple:
+        """Create a str formatted GraphQL batch from the provided parameters
+
+        Every entry in ``params`` results in a separate invocation of the
+        GraphQL query (query or mutation) ``name``. Invocations are addressed
+        through the aliases ``b0``, ``b1``, etc. and their variables are
+        prefixed with the alias to keep them apart.
+
+        :param method: Method type of the GraphQL query. This can either be
+            a mutation or a query.
+        :type method: str
+        :param name: Name of the GraphQL query (query or mutation) to execute
+        :type name: str
+        :param params: A list of parameter dicts for the GraphQL query
+        :type params: List[dict]
+        :param fields: List of fields to return by the GraphQL query
+        :type fields: List[str], optional
+
+        :returns tuple: A str encoded GraphQL query and a dict with the
+            variables for the query.
+
+        :raises ValueError: An error when invalid parameters were supplied
+        """
+
+        variables = dict()
+        variable_specs = []
+        selections = []
+
+        if fields is not None:
+            query_fields = ",".join(fields)
+        else:
+            query_fields = ""
+
+        for i, batch_params in enumerate(params):
+            alias = f"b{i}"
+            variable_mappings = []
+
+            batch_params = cls._drop_unset_params(batch_params)
+
+            if batch_params is not None:
+                for key, value in batch_params.items():
+
+                    # raise an error so we know if we missed specifying a
+                    # graphQL parameter.
+                    if not isinstance(value, GraphQLParam):
+                        raise ValueError(
+                            f"parameter {key} is not a GraphQLParam")
+
+                    variable = f"{alias}_{key}"
+                    variables[variable] = value
+                    variable_specs.append(f"${variable}:{value.type_spec}")
+                    variable_mappings.append(f"{key}: ${variable}")
+
+            selection = f"{alias}:{name}"
+            if len(variable_mappings) > 0:
+                selection += "(%s)" % ", ".join(variable_mappings)
+            if len(query_fields) > 0:
+                selection += "{%s}" % query_fields
+
+            selections.append(selection)
+
+        if len(variable_specs) == 0:
+            return "%s{%s}" % (method, " ".join(selections)), variables
+
+        return "%s(%s){%s}" % (
+            method,
+            ",".join(variable_specs),
+            " ".join(selections)
+        ), variables
 
     @classmethod
     def _format_method(
@@ -623,8 +1154,9 @@ class GraphQLClient:
         :raises ValueError: An error when invalid parameters were supplied
         """
 
-        variable_specs = []
-        variable_mappings = []
+        # the signature of the parameters identifies the GraphQL text, while
+        # the parameter values are sent separately as variables
+        signature = []
 
         if params is not None:
             for key, value in params.items():
@@ -632,8 +1164,7 @@ class GraphQLClient:
                 # if it is a tuple, it contains needed info for parameter type
                 # (value, type_name, mandatory)
                 if isinstance(value, GraphQLParam):
-                    variable_specs.append(f"${key}:{value.type_spec}")
-                    variable_mappings.append(f"{key}: ${key}")
+                    signature.append((key, value.type_spec))
                     continue
 
                 # raise an error so we know if we missed specifying a
@@ -641,28 +1172,6 @@ class GraphQLClient:
                 raise ValueError(f"parameter {key} is not a GraphQLParam")
 
         if fields is not None:
-            query_fields = ",".join(fields)
-        else:
-            query_fields = ""
-
-        if len(variable_specs) == 0 and len(query_fields) == 0:
-            return "%s{%s}" % (method, name)
-
-        if len(variable_specs) == 0 and len(query_fields) > 0:
-            return "%s{%s{%s}}" % (method, name, query_fields)
+            fields = tuple(fields)
 
-        if len(variable_specs) > 0 and len(query_fields) == 0:
-            return "%s(%s){%s(%s)}" % (
-                method,
-                ",".join(variable_specs),
-                name,
-                ", ".join(variable_mappings)
-            )
-
-        return "%s(%s){%s(%s){%s}}" % (
-            method,
-            ",".join(variable_specs),
-            name,
-            ", ".join(variable_mappings),
-            query_fields
-        )
+        return _build_method(method, name, tuple(signature), fields)
@@ -11,6 +11,7 @@
 # DEALINGS IN THE SOFTWARE.
 #
 
+from functools import lru_cache
 from .common import read_value
 
 
@@ -54,11 +55,12 @@ class IssueInstance:
         return self.__message
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def fields():
-        return [
+        return (
             "spuSerials",
             "message",
-        ]
+        )
 
 
 class Issues:
@@ -101,11 +103,12 @@ class Issues:
         return self.__errors
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def fields():
-        return [
+        return (
             "warnings{%s}" % ",".join(IssueInstance.fields()),
             "errors{%s}" % ",".join(IssueInstance.fields()),
-        ]
+        )
 
     def assert_no_issues(
             self,
@@ -11,7 +11,12 @@
 # DEALINGS IN THE SOFTWARE.
 #
 
-from .graphqlclient import GraphQLParam, NebMixin
+import sys
+import ipaddress
+from functools import lru_cache
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
+from .graphqlclient import GraphQLParam, GraphQLError, NebMixin
 from datetime import datetime
 from .common import PageInput, read_value
 from .filters import StringFilter, UUIDFilter
@@ -22,6 +27,7 @@ from .npods import NPodSpuInput, \
     BondTransmitHashPolicy
 from .updates import UpdateHistory
 from .tokens import TokenResponse
+from .constants import TOKEN_MAX_WORKERS
 
 __all__ = [
     "SpuSort",
@@ -61,6 +67,7 @@ class SpuSort:
         """
 
         self.__serial = serial
+        self.__as_dict = None
 
     @property
     def serial(self) -> SortDirection:
@@ -69,9 +76,11 @@ class SpuSort:
 
     @property
     def as_dict(self):
-        result = dict()
-        result["serial"] = self.serial
-        return result
+        if self.__as_dict is None:
+            self.__as_dict = MappingProxyType({
+                "serial": self.__serial,
+            })
+        return self.__as_dict
 
 
 class SpuFilter:
@@ -122,6 +131,7 @@ class SpuFilter:
         self.__npod_uuid = npod_uuid
         self.__and = and_filter
         self.__or = or_filter
+        self.__as_dict = None
 
     @property
     def serial(self) -> StringFilter:
@@ -160,15 +170,17 @@ class SpuFilter:
 
     @property
     def as_dict(self):
-        result = dict()
-        result["serial"] = self.serial
-        result["notInNPod"] = self.not_in_npod
-        result["hostIOCWWN"] = self.host_ioc_wwn
-        result["storageIOCWWN"] = self.storage_ioc_wwn
-        result["nPodUUID"] = self.npod_uuid
-        result["and"] = self.and_filter
-        result["or"] = self.or_filter
-        return result
+        if self.__as_dict is None:
+            self.__as_dict = MappingProxyType({
+                "serial": self.__serial,
+                "notInNPod": self.__not_in_npod,
+                "hostIOCWWN": self.__host_ioc_wwn,
+                "storageIOCWWN": self.__storage_ioc_wwn,
+                "nPodUUID": self.__npod_uuid,
+                "and": self.__and,
+                "or": self.__or,
+            })
+        return self.__as_dict
 
 
 class DebugInfoInput:
@@ -226,6 +238,7 @@ class DebugInfoInput:
         self.__spu_serial = spu_serial
         self.__note = note
         self.__support_case_number = support_case_number
+        self.__as_dict = None
 
     @property
     def npod_uuid(self) -> str:
@@ -249,12 +262,14 @@ class DebugInfoInput:
 
     @property
     def as_dict(self):
-        result = dict()
-        result["nPodUUID"] = self.npod_uuid
-        result["spuSerial"] = self.spu_serial
-        result["note"] = self.note
-        result["supportCaseNumber"] = self.support_case_number
-        return result
+        if self.__as_dict is None:
+            self.__as_dict = MappingProxyType({
+                "nPodUUID": self.__npod_uuid,
+                "spuSerial": self.__spu_serial,
+                "note": self.__note,
+                "supportCaseNumber": self.__support_case_number,
+            })
+        return self.__as_dict
 
 
 class NTPServerInput:
@@ -292,6 +307,7 @@ class NTPServerInput:
         self.__server_hostname = server_hostname
         self.__pool = pool
         self.__prefer = prefer
+        self.__as_dict = None
 
     @property
     def server_hostname(self) -> str:
@@ -310,11 +326,13 @@ class NTPServerInput:
 
     @property
     def as_dict(self):
-        result = dict()
-        result["serverHostname"] = self.server_hostname
-        result["pool"] = self.pool
-        result["prefer"] = self.prefer
-        return result
+        if self.__as_dict is None:
+            self.__as_dict = MappingProxyType({
+                "serverHostname": self.__server_hostname,
+                "pool": self.__pool,
+                "prefer": self.__prefer,
+            })
+        return self.__as_dict
 
 
 class SecureEraseSPUInput:
@@ -340,6 +358,7 @@ class SecureEraseSPUInput:
         """
 
         self.__spu_serial = spu_serial
+        self.__as_dict = None
 
     @property
     def spu_serial(self) -> str:
@@ -348,9 +367,11 @@ class SecureEraseSPUInput:
 
     @property
     def as_dict(self):
-        result = dict()
-        result["spuSerial"] = self.spu_serial
-        return result
+        if self.__as_dict is None:
+            self.__as_dict = MappingProxyType({
+                "spuSerial": self.__spu_serial,
+            })
+        return self.__as_dict
 
 
 class ReplaceSpuInput:
@@ -382,6 +403,7 @@ class ReplaceSpuInput:
 
         self.__previous_spu_serial = previous_spu_serial
         self.__new_spu_info = new_spu_info
+        self.__as_dict = None
 
     @property
     def previous_spu_serial(self) -> str:
@@ -395,10 +417,12 @@ class ReplaceSpuInput:
 
     @property
     def as_dict(self):
-        result = dict()
-        result["previousSPUSerial"] = self.previous_spu_serial
-        result["newSPUInfo"] = self.new_spu_info
-        return result
+        if self.__as_dict is None:
+            self.__as_dict = MappingProxyType({
+                "previousSPUSerial": self.__previous_spu_serial,
+                "newSPUInfo": self.__new_spu_info,
+            })
+        return self.__as_dict
 
 
 class SetNTPServersInput:
@@ -437,6 +461,7 @@ class SetNTPServersInput:
         self.__spu_serial = spu_serial
         self.__npod_uuid = npod_uuid
         self.__servers = servers
+        self.__as_dict = None
 
     @property
     def spu_serial(self) -> str:
@@ -455,11 +480,13 @@ class SetNTPServersInput:
 
     @property
     def as_dict(self):
-        result = dict()
-        result["spuSerial"] = self.spu_serial
-        result["podUUID"] = self.npod_uuid
-        result["servers"] = self.servers
-        return result
+        if self.__as_dict is None:
+            self.__as_dict = MappingProxyType({
+                "spuSerial": self.__spu_serial,
+                "podUUID": self.__npod_uuid,
+                "servers": self.__servers,
+            })
+        return self.__as_dict
 
 
 class NTPServer:
@@ -469,6 +496,12 @@ class NTPServer:
     processing unit (SPU).
     """
 
+    __slots__ = (
+        "__server_hostname",
+        "__pool",
+        "__prefer",
+    )
+
     def __init__(
             self,
             response: dict
@@ -508,17 +541,45 @@ class NTPServer:
         return self.__prefer
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def fields():
-        return [
+        return (
             "serverHostname",
             "pool",
             "prefer",
-        ]
+        )
+
+
+# GraphQL selection of NTPServer fields, used when querying nested objects
+_NTP_SERVER_SELECTION = ",".join(NTPServer.fields())
 
 
 class IPInfoState:
     """A state for IP configuration of a SPU logical network interface"""
 
+    __slots__ = (
+        "__dhcp",
+        "__addresses",
+        "__gateway",
+        "__bond_mode",
+        "__bond_transmit_hash_policy",
+        "__bond_mii_monitor_milli_seconds",
+        "__bond_lacp_transmit_rate",
+        "__interface_names",
+        "__display_interface_names",
+        "__interface_mac",
+        "__half_duplex",
+        "__speed",
+        "__locked_speed",
+        "__mtu",
+        "__switch_name",
+        "__switch_mac",
+        "__switch_port",
+        "__link_active",
+        "__netmask_bits",
+        "__networks",
+    )
+
     def __init__(
             self,
             response: dict
@@ -573,6 +634,7 @@ class IPInfoState:
             "linkActive", response, bool, True)
         self.__netmask_bits = read_value(
             "netmaskBits", response, int, 0)
+        self.__networks = None
 
     @property
     def dhcp(self) -> bool:
@@ -584,6 +646,22 @@ class IPInfoState:
         """List of IPv4 or IPv6 addresses in CIDR format"""
         return self.__addresses
 
+    @property
+    def networks(self) -> tuple:
+        """The IPv4 or IPv6 networks of the addresses in CIDR format
+
+        The addresses are parsed once on first access. Each element is an
+        ``ipaddress.IPv4Network`` or ``ipaddress.IPv6Network`` that can be
+        used for membership tests, e.g. ``address in network``.
+
+        :raises ValueError: If an address is not a valid CIDR network
+        """
+        if self.__networks is None:
+            self.__networks = tuple(
+                ipaddress.ip_network(a, strict=False)
+                for a in self.__addresses)
+        return self.__networks
+
     @property
     def gateway(self) -> str:
         """The gateway IP address specified for the interface"""
@@ -670,8 +748,9 @@ class IPInfoState:
         return self.__netmask_bits
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def fields():
-        return [
+        return (
             "dhcp",
             "addresses",
             "gateway",
@@ -690,13 +769,43 @@ class IPInfoState:
             "switchMAC",
             "switchPort",
             "linkActive",
-            "netmaskBits"
-        ]
+            "netmaskBits",
+        )
+
+
+# GraphQL selection of IPInfoState fields, used when querying nested objects
+_IP_INFO_STATE_SELECTION = ",".join(IPInfoState.fields())
 
 
 class Spu:
     """A services processing unit"""
 
+    __slots__ = (
+        "__npod_uuid",
+        "__host_uuid",
+        "__serial",
+        "__version",
+        "__version_package_names",
+        "__spu_type",
+        "__hw_revision",
+        "__control_interface",
+        "__data_interfaces",
+        "__lun_count",
+        "__physical_drive_count",
+        "__npod_member_can_talk_count",
+        "__uptime_seconds",
+        "__update_history",
+        "__last_reported",
+        "__reset_reason_int",
+        "__reset_reason_string",
+        "__ntp_servers",
+        "__ntp_status",
+        "__time_zone",
+        "__uefi_version",
+        "__wiping",
+        "__recovery_version",
+    )
+
     def __init__(
             self,
             response: dict
@@ -719,14 +828,16 @@ class Spu:
             "host.uuid", response, str, False)
         self.__serial = read_value(
             "serial", response, str, True)
-        self.__version = read_value(
-            "version", response, str, True)
+        # values with few distinct values across all SPUs are interned, so
+        # that large lists of SPUs share a single copy of these strings
+        self.__version = sys.intern(read_value(
+            "version", response, str, True))
         self.__version_package_names = read_value(
             "versionPackageNames", response, str, True)
-        self.__spu_type = read_value(
-            "spuType", response, str, True)
-        self.__hw_revision = read_value(
-            "hwRevision", response, str, True)
+        self.__spu_type = sys.intern(read_value(
+            "spuType", response, str, True))
+        self.__hw_revision = sys.intern(read_value(
+            "hwRevision", response, str, True))
         self.__control_interface = read_value(
             "controlInterface", response, IPInfoState, False)
         self.__data_interfaces = read_value(
@@ -749,10 +860,10 @@ class Spu:
             "resetReasonString", response, str, True)
         self.__ntp_servers = read_value(
             "ntpServers", response, NTPServer, True)
-        self.__ntp_status = read_value(
-            "ntpStatus", response, str, True)
-        self.__time_zone = read_value(
-            "timeZone", response, str, True)
+        self.__ntp_status = sys.intern(read_value(
+            "ntpStatus", response, str, True))
+        self.__time_zone = sys.intern(read_value(
+            "timeZone", response, str, True))
         self.__uefi_version = read_value(
             "uefiVersion", response, str, True)
         self.__wiping = read_value(
@@ -876,8 +987,9 @@ class Spu:
         return self.__recovery_version
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def fields():
-        return [
+        return (
             "nPod{uuid}",
             "host{uuid}",
             "serial",
@@ -885,8 +997,8 @@ class Spu:
             "versionPackageNames",
             "spuType",
             "hwRevision",
-            "controlInterface{%s}" % ",".join(IPInfoState.fields()),
-            "dataInterfaces{%s}" % ",".join(IPInfoState.fields()),
+            "controlInterface{%s}" % _IP_INFO_STATE_SELECTION,
+            "dataInterfaces{%s}" % _IP_INFO_STATE_SELECTION,
             "lunCount",
             "physicalDriveCount",
             "podMemberCanTalkCount",
@@ -895,13 +1007,13 @@ class Spu:
             "lastReported",
             "resetReasonInt",
             "resetReasonString",
-            "ntpServers{%s}" % ",".join(NTPServer.fields()),
+            "ntpServers{%s}" % _NTP_SERVER_SELECTION,
             "ntpStatus",
             "timeZone",
             "uefiVersion",
             "wiping",
-            "recoveryVersion"
-        ]
+            "recoveryVersion",
+        )
 
 
 class SpuList:
@@ -915,6 +1027,13 @@ class SpuList:
     the server does not return the full list of alerts but only one page.
     """
 
+    __slots__ = (
+        "__items",
+        "__more",
+        "__total_count",
+        "__filtered_count",
+    )
+
     def __init__(
             self,
             response: dict
@@ -961,13 +1080,14 @@ class SpuList:
         return self.__filtered_count
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def fields():
-        return [
+        return (
             "items{%s}" % ",".join(Spu.fields()),
             "more",
             "totalCount",
             "filteredCount",
-        ]
+        )
 
 
 class SpuCustomDiagnostic:
@@ -978,6 +1098,14 @@ class SpuCustomDiagnostic:
     troubleshooting issues during a support case.
     """
 
+    __slots__ = (
+        "__request_uuid",
+        "__diagnostic_name",
+        "__spu_serial",
+        "__once_only",
+        "__note",
+    )
+
     def __init__(
             self,
             response: dict
@@ -1030,14 +1158,15 @@ class SpuCustomDiagnostic:
         return self.__note
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def fields():
-        return [
+        return (
             "requestUID",
             "diagnosticName",
             "spuSerial",
             "onceOnly",
             "note",
-        ]
+        )
 
 
 class SpuMixin(NebMixin):
@@ -1070,13 +1199,14 @@ class SpuMixin(NebMixin):
         """
 
         # setup query parameters
-        parameters = dict()
-        parameters["page"] = GraphQLParam(
-            page, "PageInput", False)
-        parameters["filter"] = GraphQLParam(
-            spu_filter, "SPUFilter", False)
-        parameters["sort"] = GraphQLParam(
-            sort, "SPUSort", False)
+        parameters = {
+            "page": GraphQLParam(
+                page, "PageInput", False),
+            "filter": GraphQLParam(
+                spu_filter, "SPUFilter", False),
+            "sort": GraphQLParam(
+                sort, "SPUSort", False),
+        }
 
         # make the request
         response = self._query(
@@ -1088,6 +1218,108 @@ class SpuMixin(NebMixin):
         # convert to object
         return SpuList(response)
 
+    def get_all_spus(
+            self,
+            spu_filter: SpuFilter = None,
+            sort: SpuSort = None,
+            page_size: int = 100
+    ) -> [Spu]:
+        """Retrieves all SPUs across all pages
+
+        Retrieves the first page of SPUs to determine the number of SPUs
+        matching the filter. The remaining pages are then retrieved with
+        batched requests of several pages each instead of requesting one page
+        after another.
+
+        :param spu_filter: A filter object to filter the SPUs on the
+            server. If omitted, the server will return all objects.
+        :type spu_filter: SpuFilter, optional
+        :param sort: A sort definition object to sort the SPU objects on
+            supported properties. If omitted objects are returned in the order
+            as they were created in.
+        :type sort: SpuSort, optional
+        :param page_size: The number of SPUs to request per page. Defaults to
+            ``100`` items.
+        :type page_size: int, optional
+
+        :returns [Spu]: A list of all SPUs matching the filter
+
+        :raises ValueError: If ``page_size`` is not a positive number
+        :raises GraphQLError: An error with the GraphQL endpoint.
+        """
+
+        # setup query parameters
+        parameters = {
+            "filter": GraphQLParam(
+                spu_filter, "SPUFilter", False),
+            "sort": GraphQLParam(
+                sort, "SPUSort", False),
+        }
+
+        # make the request
+        response = self._query_all_pages(
+            name="getSPUs",
+            params=parameters,
+            fields=SpuList.fields(),
+            page_size=page_size
+        )
+
+        # convert to object
+        return [spu for page in response for spu in SpuList(page).items]
+
+    def get_spus_batch(
+            self,
+            spu_filters: [SpuFilter],
+            page: PageInput = None,
+            sort: SpuSort = None
+    ) -> [SpuList]:
+        """Retrieves lists of SPUs for multiple filters at once
+
+        Runs one ``get_spus`` query for every provided filter. The queries are
+        sent to nebulon ON in batched requests, which avoids a network
+        round-trip per filter.
+
+        :param spu_filters: A list of filter objects to filter the SPUs on the
+            server. One paginated list of SPUs is returned for every filter.
+        :type spu_filters: [SpuFilter]
+        :param page: The requested page from the server. This is an optional
+            argument and if omitted the server will default to returning the
+            first page with a maximum of ``100`` items.
+        :type page: PageInput, optional
+        :param sort: A sort definition object to sort the SPU objects on
+            supported properties. If omitted objects are returned in the order
+            as they were created in.
+        :type sort: SpuSort, optional
+
+        :returns [SpuList]: A paginated list of SPUs for every provided filter
+            in the order of the provided filters
+
+        :raises GraphQLError: An error with the GraphQL endpoint.
+        """
+
+        # setup query parameters
+        parameters = []
+        for spu_filter in spu_filters:
+            batch_parameters = {
+                "page": GraphQLParam(
+                    page, "PageInput", False),
+                "filter": GraphQLParam(
+                    spu_filter, "SPUFilter", False),
+                "sort": GraphQLParam(
+                    sort, "SPUSort", False),
+            }
+            parameters.append(batch_parameters)
+
+        # make the request
+        response = self._query_batch(
+            name="getSPUs",
+            params=parameters,
+            fields=SpuList.fields()
+        )
+
+        # convert to object
+        return [SpuList(i) for i in response]
+
     def get_spu_custom_diagnostics(
             self,
             spu_serial: str
@@ -1109,9 +1341,10 @@ class SpuMixin(NebMixin):
         """
 
         # setup query parameters
-        parameters = dict()
-        parameters["spuSerial"] = GraphQLParam(
-            spu_serial, "String", False)
+        parameters = {
+            "spuSerial": GraphQLParam(
+                spu_serial, "String", False),
+        }
 
         # make the request
         response = self._query(
@@ -1121,7 +1354,7 @@ class SpuMixin(NebMixin):
         )
 
         # convert to object
-        return [SpuCustomDiagnostic(i) for i in response]
+        return list(map(SpuCustomDiagnostic, response))
 
     def claim_spu(
             self,
@@ -1153,9 +1386,10 @@ class SpuMixin(NebMixin):
         """
 
         # setup query parameters
-        parameters = dict()
-        parameters["serial"] = GraphQLParam(
-            spu_serial, "String", True)
+        parameters = {
+            "serial": GraphQLParam(
+                spu_serial, "String", True),
+        }
 
         # make the request
         response = self._mutation(
@@ -1189,9 +1423,10 @@ class SpuMixin(NebMixin):
         """
 
         # setup query parameters
-        parameters = dict()
-        parameters["serial"] = GraphQLParam(
-            spu_serial, "String", True)
+        parameters = {
+            "serial": GraphQLParam(
+                spu_serial, "String", True),
+        }
 
         # make the request
         response = self._mutation(
@@ -1230,9 +1465,10 @@ class SpuMixin(NebMixin):
         """
 
         # setup query parameters
-        parameters = dict()
-        parameters["serial"] = GraphQLParam(
-            spu_serial, "String", True)
+        parameters = {
+            "serial": GraphQLParam(
+                spu_serial, "String", True),
+        }
 
         # make the request
         response = self._mutation(
@@ -1248,6 +1484,88 @@ class SpuMixin(NebMixin):
         )
         token_response.deliver_token()
 
+    def ping_spus(
+            self,
+            spu_serials: [str],
+            ignore_warnings: bool = False,
+    ):
+        """Turns on the locate LED pattern of multiple SPUs
+
+        Works like ``ping_spu`` for a list of SPUs. The pings are requested
+        from nebulon ON in batched requests and the resulting tokens are
+        delivered to the SPUs concurrently.
+
+        :param spu_serials: The serial numbers of the SPUs
+        :type spu_serials: [str]
+        :param ignore_warnings: If specified and set to ``True`` the operation
+            will proceed even if nebulon ON reports warnings. It is
+            advised to not ignore warnings. Consequently, the default behavior
+            is that the operation will fail when nebulon ON reports
+            validation errors or warnings.
+        :type ignore_warnings: bool, optional
+
+        :raises GraphQLError: An error with the GraphQL endpoint. If the ping
+            of some SPUs fails, the tokens for the pings that nebulon ON
+            accepted are delivered before the error is raised. If nebulon ON
+            returns no data for the batch, the SPUs without a known outcome
+            are pinged one by one and the first error is raised.
+        :raises Exception: An error when delivering a token to a SPU
+        """
+
+        # setup query parameters
+        parameters = [{
+            "serial": GraphQLParam(
+                spu_serial, "String", True),
+        } for spu_serial in spu_serials]
+
+        # make the request. Pings that nebulon ON accepted still need their
+        # token delivered if the ping of another SPU failed
+        batch_error = None
+        try:
+            response = self._mutation_batch(
+                name="pingSPUV2",
+                params=parameters,
+                fields=TokenResponse.fields()
+            )
+        except GraphQLError as error:
+            batch_error = error
+            response = [i for i in error.results if i is not None]
+
+            # a failed ping can discard the data of the entire batch, so that
+            # the tokens of accepted pings are lost. Pinging is repeatable, so
+            # these SPUs are pinged one by one
+            if error.response.get("data") is None:
+                batch_error = None
+                unknown = [parameters[i] for i, result
+                           in enumerate(error.results) if result is None]
+
+                for params in unknown:
+                    try:
+                        response.append(self._mutation(
+                            name="pingSPUV2",
+                            params=params,
+                            fields=TokenResponse.fields()
+                        ))
+                    except GraphQLError as ping_error:
+                        if batch_error is None:
+                            batch_error = ping_error
+
+        # convert to object. All responses are validated before any token
+        # is delivered
+        token_responses = [TokenResponse(
+            response=i,
+            ignore_warnings=ignore_warnings,
+        ) for i in response]
+
+        if len(token_responses) > 0:
+            workers = min(len(token_responses), TOKEN_MAX_WORKERS)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(
+                    TokenResponse.deliver_token, token_responses))
+
+        if batch_error is not None:
+            raise batch_error
+
     def collect_debug_info(
             self,
             debug_info_input: DebugInfoInput,
@@ -1274,9 +1592,10 @@ class SpuMixin(NebMixin):
         """
 
         # setup query parameters
-        parameters = dict()
-        parameters["input"] = GraphQLParam(
-            debug_info_input, "DebugInfoInput", True)
+        parameters = {
+            "input": GraphQLParam(
+                debug_info_input, "DebugInfoInput", True),
+        }
 
         # make the request
         response = self._mutation(
@@ -1322,9 +1641,10 @@ class SpuMixin(NebMixin):
         """
 
         # setup query parameters
-        parameters = dict()
-        parameters["requestUID"] = GraphQLParam(
-            request_uuid, "String", False)
+        parameters = {
+            "requestUID": GraphQLParam(
+                request_uuid, "String", False),
+        }
 
         # make the request
         response = self._mutation(
@@ -1377,15 +1697,16 @@ class SpuMixin(NebMixin):
         """
 
         # setup query parameters
-        parameters = dict()
-        parameters["spuSerial"] = GraphQLParam(
-            spu_serial, "String", False)
-        parameters["podUID"] = GraphQLParam(
-            npod_uuid, "String", False)
-        parameters["diagnosticName"] = GraphQLParam(
-            diagnostic_name, "String", False)
-        parameters["requestUID"] = GraphQLParam(
-            request_uuid, "String", False)
+        parameters = {
+            "spuSerial": GraphQLParam(
+                spu_serial, "String", False),
+            "podUID": GraphQLParam(
+                npod_uuid, "String", False),
+            "diagnosticName": GraphQLParam(
+                diagnostic_name, "String", False),
+            "requestUID": GraphQLParam(
+                request_uuid, "String", False),
+        }
 
         # make the request
         response = self._mutation(
@@ -1422,9 +1743,10 @@ class SpuMixin(NebMixin):
         """
 
         # setup query parameters
-        parameters = dict()
-        parameters["spuSerial"] = GraphQLParam(
-            spu_serial, "String", True)
+        parameters = {
+            "spuSerial": GraphQLParam(
+                spu_serial, "String", True),
+        }
 
         # make the request
         response = self._mutation(
@@ -1464,9 +1786,10 @@ class SpuMixin(NebMixin):
         """
 
         # setup query parameters
-        parameters = dict()
-        parameters["spuSerial"] = GraphQLParam(spu_serial, "String", True)
-        parameters["proxy"] = GraphQLParam(proxy, "String", True)
+        parameters = {
+            "spuSerial": GraphQLParam(spu_serial, "String", True),
+            "proxy": GraphQLParam(proxy, "String", True),
+        }
 
         # make the request
         response = self._mutation(
@@ -1509,12 +1832,13 @@ class SpuMixin(NebMixin):
         """
 
         # setup query parameters
-        parameters = dict()
-        parameters["input"] = GraphQLParam(
-            replace_spu_input,
-            "ReplaceSPUInput",
-            True
-        )
+        parameters = {
+            "input": GraphQLParam(
+                replace_spu_input,
+                "ReplaceSPUInput",
+                True
+            ),
+        }
 
         # make the request
         response = self._mutation(
@@ -1554,12 +1878,13 @@ class SpuMixin(NebMixin):
         :raises Exception: An error when delivering a token to the SPU
         """
         # setup query parameters
-        parameters = dict()
-        parameters["spuSerial"] = GraphQLParam(
-            spu_serial,
-            "String",
-            True
-        )
+        parameters = {
+            "spuSerial": GraphQLParam(
+                spu_serial,
+                "String",
+                True
+            ),
+        }
 
         # make the request
         response = self._mutation(
@@ -1601,12 +1926,13 @@ class SpuMixin(NebMixin):
         """
 
         # setup query parameters
-        parameters = dict()
-        parameters["input"] = GraphQLParam(
-            ntp_servers_input,
-            "SetNTPServersInput",
-            True
-        )
+        parameters = {
+            "input": GraphQLParam(
+                ntp_servers_input,
+                "SetNTPServersInput",
+                True
+            ),
+        }
 
         # make the request
         response = self._mutation(
@@ -1647,14 +1973,15 @@ class SpuMixin(NebMixin):
         """
 
         # setup query parameters
-        parameters = dict()
-        parameters["input"] = GraphQLParam(
-            SecureEraseSPUInput(
-                spu_serial=spu_serial
+        parameters = {
+            "input": GraphQLParam(
+                SecureEraseSPUInput(
+                    spu_serial=spu_serial
+                ),
+                "SecureEraseSPUInput",
+                True
             ),
-            "SecureEraseSPUInput",
-            True
-        )
+        }
 
         # make the request
         response = self._mutation(
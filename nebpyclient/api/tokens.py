@@ -12,11 +12,111 @@
 #
 
 import json
+import logging
+import threading
 import requests
+from collections import OrderedDict
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor
 from .common import read_value
 from .issues import Issues
 
-from .constants import TOKEN_TIMEOUT_SECONDS
+from .constants import TOKEN_TIMEOUT_SECONDS, TOKEN_MAX_WORKERS
+
+_LOGGER = logging.getLogger(__name__)
+
+# session for token delivery. Connections to SPUs are pooled and kept alive,
+# so that repeated deliveries to the same SPU do not need a new TLS handshake.
+# Tokens of a batched mutation are delivered concurrently and each of them
+# delivers to its SPUs concurrently, so the pool is sized for both levels
+_SESSION_POOL_SIZE = TOKEN_MAX_WORKERS * TOKEN_MAX_WORKERS
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=_SESSION_POOL_SIZE,
+    pool_maxsize=_SESSION_POOL_SIZE
+))
+
+# IP addresses of SPUs that recently accepted a token, most recent last.
+# Subsequent deliveries try these SPUs first, so that an unreachable SPU does
+# not delay every mutation of a script by the token timeout
+_REACHABLE_IPS = OrderedDict()
+_REACHABLE_IPS_CAPACITY = 64
+_REACHABLE_IPS_LOCK = threading.Lock()
+
+
+def _order_by_reachability(ips) -> list:
+    """Order IP addresses so that recently reachable SPUs come first
+
+    IP addresses that are not known to be reachable keep their order.
+    """
+    with _REACHABLE_IPS_LOCK:
+        rank = {ip: i for i, ip in enumerate(reversed(_REACHABLE_IPS))}
+
+    return sorted(ips, key=lambda ip: rank.get(ip, len(rank)))
+
+
+def _mark_reachable(
+        ip: str,
+        reachable: bool
+):
+    """Record if token delivery to the SPU with the IP address succeeded"""
+    with _REACHABLE_IPS_LOCK:
+        if not reachable:
+            _REACHABLE_IPS.pop(ip, None)
+            return
+
+        _REACHABLE_IPS[ip] = None
+        _REACHABLE_IPS.move_to_end(ip)
+
+        if len(_REACHABLE_IPS) > _REACHABLE_IPS_CAPACITY:
+            _REACHABLE_IPS.popitem(last=False)
+
+
+# exponentially weighted success rates of token deliveries to SPU control
+# ports, by DNS name. Control ports without history are assumed reachable.
+# A control port that mostly failed is skipped, but probed again after a
+# number of skipped deliveries so that its success rate can recover
+_CONTROL_PORT_SUCCESS_RATES = dict()
+_CONTROL_PORT_SUCCESS_ALPHA = 0.1
+_CONTROL_PORT_SKIPS = dict()
+_CONTROL_PORT_PROBE_INTERVAL = 10
+_CONTROL_PORT_SUCCESS_LOCK = threading.Lock()
+
+
+def _try_control_port_first(
+        dns: str
+) -> bool:
+    """Decide if a token delivery should try the control port first
+
+    Control ports that mostly succeeded are always tried first. Others are
+    skipped and only probed every ``_CONTROL_PORT_PROBE_INTERVAL`` deliveries.
+    """
+    with _CONTROL_PORT_SUCCESS_LOCK:
+        if _CONTROL_PORT_SUCCESS_RATES.get(dns, 1.0) >= 0.5:
+            _CONTROL_PORT_SKIPS.pop(dns, None)
+            return True
+
+        skips = _CONTROL_PORT_SKIPS.get(dns, 0) + 1
+        if skips >= _CONTROL_PORT_PROBE_INTERVAL:
+            _CONTROL_PORT_SKIPS.pop(dns, None)
+            return True
+
+        _CONTROL_PORT_SKIPS[dns] = skips
+        return False
+
+
+def _update_control_port_success_rate(
+        dns: str,
+        success: bool
+):
+    """Record the outcome of a token delivery to a control port"""
+    with _CONTROL_PORT_SUCCESS_LOCK:
+        rate = _CONTROL_PORT_SUCCESS_RATES.get(dns, 1.0)
+        rate += _CONTROL_PORT_SUCCESS_ALPHA * (float(success) - rate)
+        _CONTROL_PORT_SUCCESS_RATES[dns] = rate
+
 
 class MustSendTargetDNS:
     """Used in mutations for on-premises infrastructure via security triangle
@@ -24,6 +124,11 @@ class MustSendTargetDNS:
     Represents a definition of SPUs that a security token needs to be sent to.
     """
 
+    __slots__ = (
+        "__control_port_dns",
+        "__data_port_dns",
+    )
+
     def __init__(
             self,
             response: dict
@@ -55,11 +160,12 @@ class MustSendTargetDNS:
         return self.__data_port_dns
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def fields():
-        return [
+        return (
             "controlPortDNS",
             "dataPortDNS",
-        ]
+        )
 
 
 class TokenResponse:
@@ -70,6 +176,15 @@ class TokenResponse:
     triangle.
     """
 
+    __slots__ = (
+        "__token",
+        "__wait_on",
+        "__target_ips",
+        "__data_target_ips",
+        "__must_send_target_dns",
+        "__issues",
+    )
+
     def __init__(
             self,
             response: dict,
@@ -139,15 +254,16 @@ class TokenResponse:
         return self.__issues
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def fields():
-        return [
+        return (
             "token",
             "waitOn",
             "targetIPs",
             "dataTargetIPs",
             "mustSendTargetDNS{%s}" % ",".join(MustSendTargetDNS.fields()),
             "issues{%s}" % ",".join(Issues.fields()),
-        ]
+        )
 
     def _issue_one_token(
             self,
@@ -155,30 +271,64 @@ class TokenResponse:
     ) -> any:
         url = "https://%s" % ip
         try:
-            response = requests.post(
+            response = _SESSION.post(
                 url=url,
                 data=self.token,
                 timeout=TOKEN_TIMEOUT_SECONDS
             )
             if 200 <= response.status_code < 300:
-                response_text = response.text.strip()
-                if response_text == "OK" or response_text == "\"OK\"":
+                # compare the raw body, so that the common acknowledgement
+                # does not need to be decoded to text
+                body = response.content.strip()
+                if body == b"OK" or body == b"\"OK\"":
                     return True
-                
+
                 try:
                     return response.json()
                 except json.JSONDecodeError as e:
+                    response_text = response.text.strip()
                     raise Exception(f"Unexpected response from {ip}: {response_text}")
 
             # if we got here, there was an error
             reason = response.text
 
-        except requests.exceptions.ConnectTimeout:
+        except requests.exceptions.Timeout:
             reason = "request timed out"
 
-        print("Failed to deliver token to %s: %s" % (ip, reason))
+        except requests.exceptions.ConnectionError as e:
+            reason = "connection failed: %s" % e
+
+        _LOGGER.warning("Failed to deliver token to %s: %s", ip, reason)
         return False
 
+    def _issue_must_send_token(
+            self,
+            target: MustSendTargetDNS
+    ) -> bool:
+        control_port = target.control_port_dns
+
+        # send the token to the control port first and if this fails, to the
+        # data ports. If the control port of the SPU mostly failed before,
+        # e.g. because it is not routable, the data ports are tried first
+        ports = list(target.data_port_dns)
+        if _try_control_port_first(control_port):
+            ports.insert(0, control_port)
+        else:
+            ports.append(control_port)
+
+        success = False
+
+        for port in ports:
+            success = bool(self._issue_one_token(port))
+
+            if port == control_port:
+                _update_control_port_success_rate(port, success)
+
+            if success:
+                break
+
+        return success
+
     def deliver_token(self) -> any:
         """Delivers the token to SPUs
 
@@ -194,33 +344,26 @@ class TokenResponse:
             services processing unit (SPU).
         """
 
-        # first to must_send_target_dns - need to send to all of them
-        if self.must_send_target_dns is not None:
-
-            for cur in self.must_send_target_dns:
-
-                # first send the token to the control port
-                if self._issue_one_token(cur.control_port_dns):
-                    continue
+        # first to must_send_target_dns - need to send to all of them. The
+        # SPUs are independent of each other, so the token is delivered to
+        # them concurrently and an unreachable SPU does not delay the others
+        if self.must_send_target_dns:
 
-                # if this failed, send the token to the data ports
-                delivery_success = False
+            workers = min(len(self.must_send_target_dns), TOKEN_MAX_WORKERS)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(
+                    self._issue_must_send_token, self.must_send_target_dns))
 
-                for dp in cur.data_port_dns:
-                    if self._issue_one_token(dp):
-                        delivery_success = True
-                        break
+            if not all(results):
+                raise Exception("Unable to deliver token to mandatory SPUs")
 
-                if not delivery_success:
-                    raise Exception("Unable to deliver token to mandatory SPUs")
+        # second, send the token to one of the remaining SPUs. This is done
+        # sequentially, as the token must only be delivered to a single SPU
+        ips = chain(self.target_ips, self.data_target_ips or ())
 
-        # second, send the token to one of the remaining SPUs
-        ips = self.target_ips
-        if self.data_target_ips is not None:
-            ips = ips + self.data_target_ips
-
-        for ip in ips:
+        for ip in _order_by_reachability(ips):
             result = self._issue_one_token(ip)
+            _mark_reachable(ip, bool(result))
 
             if result:
                 return result
@@ -238,6 +381,11 @@ class PodTokenResponse:
     triangle.
     """
 
+    __slots__ = (
+        "__token_resp",
+        "__issues_res",
+    )
+
     def __init__(
             self,
             response: dict
@@ -269,8 +417,9 @@ class PodTokenResponse:
         return self.__issues_res
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def fields():
-        return [
+        return (
             "tokenResp{%s}" % ",".join(TokenResponse.fields()),
             "IssuesRes{%s}" % ",".join(Issues.fields()),
-        ]
+        )
@@ -11,9 +11,11 @@
 # DEALINGS IN THE SOFTWARE.
 #
 
+from functools import lru_cache
+from types import MappingProxyType
 from .graphqlclient import GraphQLParam, NebMixin
 from datetime import datetime
-from .common import NebEnum, read_value, PageInput
+from .common import NebEnum, read_value, parse_time, PageInput
 from .issues import Issues
 from .tokens import TokenResponse
 from .sorting import SortDirection
@@ -89,6 +91,7 @@ class AvailablePackagesSort:
 
         self.__package_name = package_name
         self.__release_date = release_date
+        self.__as_dict = None
 
     @property
     def package_name(self) -> SortDirection:
@@ -102,10 +105,12 @@ class AvailablePackagesSort:
 
     @property
     def as_dict(self):
-        result = dict()
-        result["packageName"] = self.package_name
-        result["releaseDate"] = self.release_date
-        return result
+        if self.__as_dict is None:
+            self.__as_dict = MappingProxyType({
+                "packageName": self.__package_name,
+                "releaseDate": self.__release_date,
+            })
+        return self.__as_dict
 
 
 class AvailablePackagesFilter:
@@ -148,6 +153,7 @@ class AvailablePackagesFilter:
         self.__package_priority = package_priority
         self.__and = and_filter
         self.__or = or_filter
+        self.__as_dict = None
 
     @property
     def package_name(self) -> StringFilter:
@@ -176,13 +182,15 @@ class AvailablePackagesFilter:
 
     @property
     def as_dict(self):
-        result = dict()
-        result["packageName"] = self.package_name
-        result["packageType"] = self.package_type
-        result["packagePriority"] = self.package_priority
-        result["and"] = self.and_filter
-        result["or"] = self.or_filter
-        return result
+        if self.__as_dict is None:
+            self.__as_dict = MappingProxyType({
+                "packageName": self.__package_name,
+                "packageType": self.__package_type,
+                "packagePriority": self.__package_priority,
+                "and": self.__and,
+                "or": self.__or,
+            })
+        return self.__as_dict
 
 
 class PackageInfo:
@@ -193,6 +201,23 @@ class PackageInfo:
     nebulon services processing units to a specific nebOS version.
     """
 
+    __slots__ = (
+        "__package_name",
+        "__package_size_bytes",
+        "__release_notes_url",
+        "__prerequisites",
+        "__package_description",
+        "__package_type",
+        "__package_priority",
+        "__release_date",
+        "__version_number",
+        "__patch_number",
+        "__support_state",
+        "__lts_version",
+        "__offline",
+        "__eligible_npod_uuids",
+    )
+
     def __init__(
             self,
             response: dict
@@ -308,8 +333,9 @@ class PackageInfo:
         return self.__offline
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def fields():
-        return [
+        return (
             "packageName",
             "packageSizeBytes",
             "releaseNotesURL",
@@ -324,7 +350,11 @@ class PackageInfo:
             "offlineCheck",
             "versionNumber",
             "patchNumber",
-        ]
+        )
+
+
+# GraphQL selection of PackageInfo fields, used when querying nested objects
+_PACKAGE_INFO_SELECTION = ",".join(PackageInfo.fields())
 
 
 class NPodRecommendedPackage:
@@ -334,6 +364,12 @@ class NPodRecommendedPackage:
     for nPods.
     """
 
+    __slots__ = (
+        "__package_name",
+        "__priority",
+        "__offline",
+    )
+
     def __init__(
             self,
             response: dict
@@ -373,12 +409,13 @@ class NPodRecommendedPackage:
         return self.__offline
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def fields():
-        return [
+        return (
             "packageName",
             "priority",
             "offline",
-        ]
+        )
 
 
 class RecommendedPackages:
@@ -388,6 +425,13 @@ class RecommendedPackages:
     customers given their current version and hardware.
     """
 
+    __slots__ = (
+        "__spu_type",
+        "__base_version",
+        "__package_name",
+        "__package_info",
+    )
+
     def __init__(
             self,
             response: dict
@@ -434,13 +478,14 @@ class RecommendedPackages:
         return self.__package_info
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def fields():
-        return [
+        return (
             "spuType",
             "baseVersion",
             "packageName",
-            "packageInfo{%s}" % ",".join(PackageInfo.fields()),
-        ]
+            "packageInfo{%s}" % _PACKAGE_INFO_SELECTION,
+        )
 
 
 class PackageInfoList:
@@ -453,6 +498,14 @@ class PackageInfoList:
     Consumers should always check for the property ``more`` as per default
     the server does not return the full list of alerts but only one page.
     """
+
+    __slots__ = (
+        "__items",
+        "__more",
+        "__total_count",
+        "__filtered_count",
+    )
+
     def __init__(
             self,
             response: dict
@@ -499,18 +552,35 @@ class PackageInfoList:
         return self.__filtered_count
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def fields():
-        return [
-            "items{%s}" % ",".join(PackageInfo.fields()),
+        return (
+            "items{%s}" % _PACKAGE_INFO_SELECTION,
             "more",
             "totalCount",
             "filteredCount",
-        ]
+        )
 
 
 class UpdateStateSpu:
     """An object describing the current state of an update installation"""
 
+    __slots__ = (
+        "__update_id",
+        "__spu_serial",
+        "__package_name",
+        "__download_progress_pct",
+        "__waiting_for_spu_serial",
+        "__waiting_for_scheduled",
+        "__waiting_for_scheduled_str",
+        "__started_install",
+        "__restarting",
+        "__restart_complete",
+        "__failure_log",
+        "__last_changed",
+        "__last_changed_str",
+    )
+
     def __init__(
             self,
             response: dict
@@ -537,8 +607,8 @@ class UpdateStateSpu:
             "downloadProgressPct", response, int, True)
         self.__waiting_for_spu_serial = read_value(
             "waitingForSPUSerial", response, str, True)
-        self.__waiting_for_scheduled = read_value(
-            "waitingForScheduled", response, datetime, False)
+        self.__waiting_for_scheduled_str = read_value(
+            "waitingForScheduled", response, str, False)
         self.__started_install = read_value(
             "startedInstall", response, bool, True)
         self.__restarting = read_value(
@@ -547,8 +617,13 @@ class UpdateStateSpu:
             "restartComplete", response, bool, True)
         self.__failure_log = read_value(
             "failureLog", response, str, False)
-        self.__last_changed = read_value(
-            "lastChanged", response, datetime, True)
+        self.__last_changed_str = read_value(
+            "lastChanged", response, str, True)
+
+        # date and time values are parsed on first access, as callers that
+        # poll the update state rarely read them
+        self.__waiting_for_scheduled = None
+        self.__last_changed = None
 
     @property
     def update_id(self) -> str:
@@ -578,6 +653,10 @@ class UpdateStateSpu:
     @property
     def waiting_for_scheduled(self) -> datetime:
         """Indicates that the SPU is waiting for a scheduled update"""
+        if self.__waiting_for_scheduled is None and \
+                self.__waiting_for_scheduled_str is not None:
+            self.__waiting_for_scheduled = parse_time(
+                self.__waiting_for_scheduled_str)
         return self.__waiting_for_scheduled
 
     @property
@@ -603,11 +682,14 @@ class UpdateStateSpu:
     @property
     def last_changed(self) -> datetime:
         """Date and time when the SPU last reported update status"""
+        if self.__last_changed is None:
+            self.__last_changed = parse_time(self.__last_changed_str)
         return self.__last_changed
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def fields():
-        return [
+        return (
             "updateID",
             "SPUSerial",
             "packageName",
@@ -619,12 +701,20 @@ class UpdateStateSpu:
             "restartComplete",
             "failureLog",
             "lastChanged",
-        ]
+        )
 
 
 class UpdateHistory:
     """An object describing past updates"""
 
+    __slots__ = (
+        "__update_id",
+        "__package_name",
+        "__start",
+        "__finish",
+        "__success",
+    )
+
     def __init__(
             self,
             response: dict
@@ -678,14 +768,15 @@ class UpdateHistory:
         return self.__success
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def fields():
-        return [
+        return (
             "updateID",
             "packageName",
             "start",
             "finish",
             "success",
-        ]
+        )
 
 
 class UpdatesMixin(NebMixin):
@@ -718,13 +809,14 @@ class UpdatesMixin(NebMixin):
         """
 
         # setup query parameters
-        parameters = dict()
-        parameters["page"] = GraphQLParam(
-            page, "PageInput", False)
-        parameters["filter"] = GraphQLParam(
-            available_packages_filter, "AvailablePackagesFilter", False)
-        parameters["sort"] = GraphQLParam(
-            sort, "AvailablePackagesSort", False)
+        parameters = {
+            "page": GraphQLParam(
+                page, "PageInput", False),
+            "filter": GraphQLParam(
+                available_packages_filter, "AvailablePackagesFilter", False),
+            "sort": GraphQLParam(
+                sort, "AvailablePackagesSort", False),
+        }
 
         # make the request
         response = self._query(
@@ -736,6 +828,64 @@ class UpdatesMixin(NebMixin):
         # convert to object
         return PackageInfoList(response)
 
+    def iter_available_packages(
+            self,
+            available_packages_filter: AvailablePackagesFilter = None,
+            sort: AvailablePackagesSort = None,
+            page_size: int = 100
+    ):
+        """Iterates over update packages across all pages
+
+        Yields the software packages of one page after another. A page is
+        only requested from the server once all packages of the previous
+        page were consumed, so no further pages are requested once the
+        caller stops iterating.
+
+        :param available_packages_filter: A filter object to filter the
+            software packages on the server. If omitted, the server will
+            return all objects.
+        :type available_packages_filter: AvailablePackagesFilter, optional
+        :param sort: A sort definition object to sort the software package
+            objects on supported properties. If omitted objects are
+            returned in the order as they were created in.
+        :type sort: AvailablePackagesSort, optional
+        :param page_size: The number of software packages to request per
+            page. Defaults to ``100`` items.
+        :type page_size: int, optional
+
+        :returns Iterator[PackageInfo]: An iterator over all software packages
+            matching the filter
+
+        :raises ValueError: If ``page_size`` is not a positive number or if
+            the server reports more packages without returning any
+        :raises GraphQLError: An error with the GraphQL endpoint
+        """
+
+        if page_size <= 0:
+            raise ValueError("page_size must be a positive number")
+
+        page_number = 1
+        more = True
+
+        while more:
+            package_list = self.get_available_packages(
+                page=PageInput(page_number, page_size),
+                available_packages_filter=available_packages_filter,
+                sort=sort
+            )
+
+            more = package_list.more
+            page_number += 1
+
+            if not package_list.items:
+                if more:
+                    raise ValueError(
+                        "getAvailablePackages reports more items but "
+                        "returned an empty page")
+                return
+
+            yield from package_list.items
+
     def __run_update_precheck(
             self,
             npod_uuid: str,
@@ -759,11 +909,12 @@ class UpdatesMixin(NebMixin):
         """
 
         # setup query parameters
-        parameters = dict()
-        parameters["podUID"] = GraphQLParam(
-            npod_uuid, "String", True)
-        parameters["packageName"] = GraphQLParam(
-            package_name, "String", True)
+        parameters = {
+            "podUID": GraphQLParam(
+                npod_uuid, "String", True),
+            "packageName": GraphQLParam(
+                package_name, "String", True),
+        }
 
         # make the request
         response = self._query(
@@ -809,13 +960,14 @@ class UpdatesMixin(NebMixin):
         issues.assert_no_issues(ignore_warnings=ignore_warnings)
 
         # setup query parameters
-        parameters = dict()
-        parameters["podUID"] = GraphQLParam(
-            npod_uuid, "String", True)
-        parameters["packageName"] = GraphQLParam(
-            package_name, "String", True)
-        parameters["scheduled"] = GraphQLParam(
-            schedule_at, "Time", False)
+        parameters = {
+            "podUID": GraphQLParam(
+                npod_uuid, "String", True),
+            "packageName": GraphQLParam(
+                package_name, "String", True),
+            "scheduled": GraphQLParam(
+                schedule_at, "Time", False),
+        }
 
         # make the request
         response = self._mutation(
@@ -853,11 +1005,12 @@ class UpdatesMixin(NebMixin):
         """
 
         # setup query parameters
-        parameters = dict()
-        parameters["podUID"] = GraphQLParam(
-            npod_uuid, "String", False)
-        parameters["updateID"] = GraphQLParam(
-            update_uuid, "String", False)
+        parameters = {
+            "podUID": GraphQLParam(
+                npod_uuid, "String", False),
+            "updateID": GraphQLParam(
+                update_uuid, "String", False),
+        }
 
         # make the request
         response = self._query(
@@ -867,7 +1020,42 @@ class UpdatesMixin(NebMixin):
         )
 
         # convert to object
-        return [UpdateStateSpu(i) for i in response]
+        return list(map(UpdateStateSpu, response))
+
+    def get_update_state_batch(
+            self,
+            npod_uuids: [str]
+    ) -> [[UpdateStateSpu]]:
+        """Retrieves the active updates of multiple nPods
+
+        Works like ``get_update_state`` for a list of nPods, but queries the
+        update state of the nPods with batched requests to nebulon ON. This
+        is useful to monitor updates of many nPods.
+
+        :param npod_uuids: The unique identifiers of the nPods
+        :type npod_uuids: [str]
+
+        :returns [[UpdateStateSpu]]: A list of ongoing updates for every
+            nPod in the order of the provided nPod identifiers
+
+        :raises GraphQLError: An error with the GraphQL endpoint.
+        """
+
+        # setup query parameters
+        parameters = [{
+            "podUID": GraphQLParam(
+                npod_uuid, "String", False),
+        } for npod_uuid in npod_uuids]
+
+        # make the request
+        response = self._query_batch(
+            name="updateState",
+            params=parameters,
+            fields=UpdateStateSpu.fields()
+        )
+
+        # convert to object
+        return [list(map(UpdateStateSpu, r)) for r in response]
 
     def update_spu_firmware(
             self,
@@ -899,13 +1087,14 @@ class UpdatesMixin(NebMixin):
         """
 
         # setup query parameters
-        parameters = dict()
-        parameters["serial"] = GraphQLParam(
-            spu_serial, "String", True)
-        parameters["packageName"] = GraphQLParam(
-            package_name, "String", True)
-        parameters["force"] = GraphQLParam(
-            force, "Boolean", False)
+        parameters = {
+            "serial": GraphQLParam(
+                spu_serial, "String", True),
+            "packageName": GraphQLParam(
+                package_name, "String", True),
+            "force": GraphQLParam(
+                force, "Boolean", False),
+        }
 
         # make the request
         response = self._mutation(
@@ -947,11 +1136,12 @@ class UpdatesMixin(NebMixin):
         """
 
         # setup query parameters
-        parameters = dict()
-        parameters["serial"] = GraphQLParam(
-            spu_serial, "String", False)
-        parameters["podUID"] = GraphQLParam(
-            npod_uuid, "String", False)
+        parameters = {
+            "serial": GraphQLParam(
+                spu_serial, "String", False),
+            "podUID": GraphQLParam(
+                npod_uuid, "String", False),
+        }
 
         # make the request
         response = self._mutation(
@@ -11,6 +11,8 @@
 # DEALINGS IN THE SOFTWARE.
 #
 
+from functools import lru_cache
+from types import MappingProxyType
 from .graphqlclient import GraphQLParam, NebMixin
 from .common import PageInput, read_value
 from .filters import StringFilter, UUIDFilter
@@ -34,6 +36,11 @@ class UserGroupSort:
     only one property to be specified.
     """
 
+    __slots__ = (
+        "__name",
+        "__as_dict",
+    )
+
     def __init__(
             self,
             name: SortDirection = None
@@ -44,6 +51,7 @@ class UserGroupSort:
         :type name: SortDirection, optional
         """
         self.__name = name
+        self.__as_dict = None
 
     @property
     def name(self) -> SortDirection:
@@ -52,9 +60,11 @@ class UserGroupSort:
 
     @property
     def as_dict(self):
-        result = dict()
-        result["name"] = self.name
-        return result
+        if self.__as_dict is None:
+            self.__as_dict = MappingProxyType({
+                "name": self.__name,
+            })
+        return self.__as_dict
 
 
 class UserGroupFilter:
@@ -66,6 +76,14 @@ class UserGroupFilter:
     concatenate multiple filters.
     """
 
+    __slots__ = (
+        "__uuid",
+        "__name",
+        "__and",
+        "__or",
+        "__as_dict",
+    )
+
     def __init__(
             self,
             uuid: UUIDFilter = None,
@@ -92,6 +110,7 @@ class UserGroupFilter:
         self.__name = name
         self.__and = and_filter
         self.__or = or_filter
+        self.__as_dict = None
 
     @property
     def uuid(self) -> UUIDFilter:
@@ -115,12 +134,14 @@ class UserGroupFilter:
 
     @property
     def as_dict(self):
-        result = dict()
-        result["uuid"] = self.uuid
-        result["name"] = self.name
-        result["and"] = self.and_filter
-        result["or"] = self.or_filter
-        return result
+        if self.__as_dict is None:
+            self.__as_dict = MappingProxyType({
+                "uuid": self.__uuid,
+                "name": self.__name,
+                "and": self.__and,
+                "or": self.__or,
+            })
+        return self.__as_dict
 
 
 class CreateUserGroupInput:
@@ -130,6 +151,13 @@ class CreateUserGroupInput:
     permissions and policies
     """
 
+    __slots__ = (
+        "__name",
+        "__policy_uuids",
+        "__note",
+        "__as_dict",
+    )
+
     def __init__(
             self,
             name: str,
@@ -155,6 +183,7 @@ class CreateUserGroupInput:
         self.__name = name
         self.__policy_uuids = policy_uuids
         self.__note = note
+        self.__as_dict = None
 
     @property
     def name(self) -> str:
@@ -173,11 +202,13 @@ class CreateUserGroupInput:
 
     @property
     def as_dict(self):
-        result = dict()
-        result["name"] = self.name
-        result["note"] = self.note
-        result["policyUUIDs"] = self.policy_uuids
-        return result
+        if self.__as_dict is None:
+            self.__as_dict = MappingProxyType({
+                "name": self.__name,
+                "note": self.__note,
+                "policyUUIDs": self.__policy_uuids,
+            })
+        return self.__as_dict
 
 
 class UpdateUserGroupInput:
@@ -187,6 +218,14 @@ class UpdateUserGroupInput:
     permissions and policies
     """
 
+    __slots__ = (
+        "__name",
+        "__user_uuids",
+        "__policy_uuids",
+        "__note",
+        "__as_dict",
+    )
+
     def __init__(
             self,
             name: str = None,
@@ -215,6 +254,7 @@ class UpdateUserGroupInput:
         self.__user_uuids = user_uuids
         self.__policy_uuids = policy_uuids
         self.__note = note
+        self.__as_dict = None
 
     @property
     def name(self) -> str:
@@ -238,12 +278,14 @@ class UpdateUserGroupInput:
 
     @property
     def as_dict(self):
-        result = dict()
-        result["name"] = self.name
-        result["note"] = self.note
-        result["userUUIDs"] = self.user_uuids
-        result["policyUUIDs"] = self.policy_uuids
-        return result
+        if self.__as_dict is None:
+            self.__as_dict = MappingProxyType({
+                "name": self.__name,
+                "note": self.__note,
+                "userUUIDs": self.__user_uuids,
+                "policyUUIDs": self.__policy_uuids,
+            })
+        return self.__as_dict
 
 
 class UserGroup:
@@ -253,6 +295,15 @@ class UserGroup:
     permissions and policies
     """
 
+    __slots__ = (
+        "__uuid",
+        "__name",
+        "__note",
+        "__user_uuids",
+        "__policy_uuids",
+        "__custom",
+    )
+
     def __init__(
             self,
             response: dict
@@ -313,15 +364,20 @@ class UserGroup:
         return self.__custom
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def fields():
-        return [
+        return (
             "uuid",
             "name",
             "note",
             "users{uuid}",
             "policies{uuid}",
             "custom"
-        ]
+        )
+
+
+# GraphQL selection of UserGroup fields, used when querying nested objects
+_USER_GROUP_SELECTION = ",".join(UserGroup.fields())
 
 
 class UserGroupList:
@@ -335,6 +391,13 @@ class UserGroupList:
     the server does not return the full list of alerts but only one page.
     """
 
+    __slots__ = (
+        "__items",
+        "__more",
+        "__total_count",
+        "__filtered_count",
+    )
+
     def __init__(
             self,
             response: dict
@@ -380,13 +443,14 @@ class UserGroupList:
         return self.__filtered_count
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def fields():
-        return [
-            "items{%s}" % ",".join(UserGroup.fields()),
+        return (
+            "items{%s}" % _USER_GROUP_SELECTION,
             "more",
             "totalCount",
             "filteredCount",
-        ]
+        )
 
 
 class UserGroupMixin(NebMixin):
@@ -419,10 +483,11 @@ class UserGroupMixin(NebMixin):
         """
 
         # setup query parameters
-        parameters = dict()
-        parameters["page"] = GraphQLParam(page, "PageInput", False)
-        parameters["filter"] = GraphQLParam(user_group_filter, "UserGroupFilter", False)
-        parameters["sort"] = GraphQLParam(sort, "UserGroupSort", False)
+        parameters = {
+            "page": GraphQLParam(page, "PageInput", False),
+            "filter": GraphQLParam(user_group_filter, "UserGroupFilter", False),
+            "sort": GraphQLParam(sort, "UserGroupSort", False),
+        }
 
         # make the request
         response = self._query(
@@ -434,6 +499,111 @@ class UserGroupMixin(NebMixin):
         # convert to object
         return UserGroupList(response)
 
+    def get_all_user_groups(
+            self,
+            user_group_filter: UserGroupFilter = None,
+            sort: UserGroupSort = None,
+            page_size: int = 100
+    ) -> [UserGroup]:
+        """Retrieves all user groups across all pages
+
+        Retrieves the first page of user groups to determine the number of
+        user groups matching the filter. The remaining pages are then
+        retrieved with batched requests of several pages each instead of
+        requesting one page after another.
+
+        :param user_group_filter: A filter object to filter the user group
+            objects on the server. If omitted, the server will return all
+            objects.
+        :type user_group_filter: UserGroupFilter, optional
+        :param sort: A sort definition object to sort the user group objects on
+            supported properties. If omitted objects are returned in the order
+            as they were created in.
+        :type sort: UserGroupSort, optional
+        :param page_size: The number of user groups to request per page.
+            Defaults to ``100`` items.
+        :type page_size: int, optional
+
+        :returns [UserGroup]: A list of all user groups matching the filter
+
+        :raises ValueError: If ``page_size`` is not a positive number
+        :raises GraphQLError: An error with the GraphQL endpoint.
+        """
+
+        # setup query parameters
+        parameters = {
+            "filter": GraphQLParam(
+                user_group_filter, "UserGroupFilter", False),
+            "sort": GraphQLParam(
+                sort, "UserGroupSort", False),
+        }
+
+        # make the request
+        response = self._query_all_pages(
+            name="getUserGroups",
+            params=parameters,
+            fields=UserGroupList.fields(),
+            page_size=page_size
+        )
+
+        # convert to object
+        return [
+            user_group
+            for page in response
+            for user_group in UserGroupList(page).items
+        ]
+
+    def get_user_groups_batch(
+            self,
+            user_group_filters: [UserGroupFilter],
+            page: PageInput = None,
+            sort: UserGroupSort = None
+    ) -> [UserGroupList]:
+        """Retrieves lists of user groups for multiple filters at once
+
+        Runs one ``get_user_groups`` query for every provided filter. The
+        queries are sent to nebulon ON in batched requests, which avoids a
+        network round-trip per filter.
+
+        :param user_group_filters: A list of filter objects to filter the user
+            group objects on the server. One paginated list of user groups is
+            returned for every filter.
+        :type user_group_filters: [UserGroupFilter]
+        :param page: The requested page from the server. This is an optional
+            argument and if omitted the server will default to returning the
+            first page with a maximum of ``100`` items.
+        :type page: PageInput, optional
+        :param sort: A sort definition object to sort the user group objects on
+            supported properties. If omitted objects are returned in the order
+            as they were created in.
+        :type sort: UserGroupSort, optional
+
+        :returns [UserGroupList]: A paginated list of user groups for every
+            provided filter in the order of the provided filters
+
+        :raises GraphQLError: An error with the GraphQL endpoint.
+        """
+
+        # setup query parameters
+        parameters = [{
+            "page": GraphQLParam(
+                page, "PageInput", False),
+            "filter": GraphQLParam(
+                user_group_filter, "UserGroupFilter", False),
+            "sort": GraphQLParam(
+                sort, "UserGroupSort", False),
+        } for user_group_filter in user_group_filters]
+
+        # make the request
+        response = self._query_batch(
+            name="getUserGroups",
+            params=parameters,
+            fields=UserGroupList.fields()
+        )
+
+        # convert to object
+        return [UserGroupList(i) for i in response]
+
     def create_user_group(
             self,
             create_user_group_input: CreateUserGroupInput
@@ -450,12 +620,13 @@ class UserGroupMixin(NebMixin):
         """
 
         # setup query parameters
-        parameters = dict()
-        parameters["input"] = GraphQLParam(
-            create_user_group_input,
-            "CreateUserGroupInput",
-            True
-        )
+        parameters = {
+            "input": GraphQLParam(
+                create_user_group_input,
+                "CreateUserGroupInput",
+                True
+            ),
+        }
 
         # make the request
         response = self._mutation(
@@ -482,17 +653,27 @@ class UserGroupMixin(NebMixin):
 
         :returns UserGroup: The updated user group
 
+        :raises ValueError: If the input object does not specify any property
+            to update
         :raises GraphQLError: An error with the GraphQL endpoint.
         """
 
+        # an update without any properties would be a request to nebulon ON
+        # that does not change anything
+        if update_user_group_input is None or all(
+                value is None
+                for value in update_user_group_input.as_dict.values()):
+            raise ValueError("no user group property specified for update")
+
         # setup query parameters
-        parameters = dict()
-        parameters["uuid"] = GraphQLParam(uuid, "UUID", True)
-        parameters["input"] = GraphQLParam(
-            update_user_group_input,
-            "UpdateUserGroupInput",
-            True
-        )
+        parameters = {
+            "uuid": GraphQLParam(uuid, "UUID", True),
+            "input": GraphQLParam(
+                update_user_group_input,
+                "UpdateUserGroupInput",
+                True
+            ),
+        }
 
         # make the request
         response = self._mutation(
@@ -520,8 +701,9 @@ class UserGroupMixin(NebMixin):
         """
 
         # setup query parameters
-        parameters = dict()
-        parameters["uuid"] = GraphQLParam(uuid, "UUID", True)
+        parameters = {
+            "uuid": GraphQLParam(uuid, "UUID", True),
+        }
 
         # make the request
         response = self._mutation(
@@ -532,3 +714,41 @@ class UserGroupMixin(NebMixin):
 
         # response is a boolean
         return response
+
+    def delete_user_groups(
+            self,
+            uuids: [str]
+    ) -> [bool]:
+        """Allows deletion of multiple user groups in batched requests
+
+        The deletions are sent to nebulon ON in batched requests, which avoids
+        a network round-trip per user group.
+
+        :param uuids: The unique identifiers of the user groups that should be
+            deleted
+        :type uuids: [str]
+
+        :returns [bool]: If the deletion was successful for every user group
+            in the order of the provided identifiers
+
+        :raises GraphQLError: An error with the GraphQL endpoint. The
+            deletions are not transactional. If some of them fail, user groups
+            with a ``True`` value in the ``results`` of the error were deleted.
+            A ``None`` value means that the outcome is unknown and the user
+            group may already be deleted, so retrying its deletion can fail.
+        """
+
+        # setup query parameters
+        parameters = [{
+            "uuid": GraphQLParam(uuid, "UUID", True),
+        } for uuid in uuids]
+
+        # make the request
+        response = self._mutation_batch(
+            name="deleteOrgUserGroup",
+            params=parameters,
+            fields=None
+        )
+
+        # response is a list of booleans
+        return response
@@ -40,5 +40,8 @@ setuptools.setup(
     install_requires=[
         'requests'
     ],
+    extras_require={
+        'speedups': ['orjson'],
+    },
     python_requires=">=3.6",
 )